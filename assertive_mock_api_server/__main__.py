@@ -4,5 +4,16 @@ import uvicorn
 
 if __name__ == "__main__":
     port = int(os.environ.get("PORT", "8910"))
+    # Stubs and the request log live in each worker's memory, so with more than
+    # one worker a request may not see the stubs added through another worker.
+    workers = int(os.environ.get("WORKERS", "1"))
 
-    uvicorn.run("assertive_mock_api_server.app:app", host="0.0.0.0", port=port)
+    # uvloop and httptools are used when installed, which they are on Linux and macOS
+    uvicorn.run(
+        "assertive_mock_api_server.app:app",
+        host="0.0.0.0",
+        port=port,
+        loop="auto",
+        http="auto",
+        workers=workers,
+    )
@@ -1,11 +1,19 @@
+import re
 from contextlib import asynccontextmanager
+from ipaddress import AddressValueError, IPv6Address
+from typing import Any
+from urllib.parse import parse_qsl
+
+import orjson
 from fastapi import FastAPI, Request
 from clean_ioc.ext.fastapi import add_container_to_app, Resolve
 from fastapi.responses import JSONResponse, Response
+from starlette.types import Receive, Scope, Send
 
 from assertive_mock_api_server.container import get_container
 from assertive_mock_api_server.core import (
     MockApiRequest,
+    MockApiResponse,
     MockApiServer,
 )
 from assertive_mock_api_server.payloads import (
@@ -16,10 +24,26 @@ from assertive_mock_api_server.payloads import (
 )
 
 
+class ORJSONResponse(JSONResponse):
+    """
+    A JSON response rendered with orjson rather than the standard library.
+    Content orjson can't encode, such as integers over 64 bits, falls back to
+    the standard library.
+    """
+
+    def render(self, content: Any) -> bytes:
+        try:
+            return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+        except orjson.JSONEncodeError:
+            return super().render(content)
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     container = get_container()
     async with add_container_to_app(app, container):
+        # Resolved once up front, the catch-all handler doesn't go through Resolve
+        app.state.mock_server = await container.resolve_async(MockApiServer)
         yield
 
 
@@ -33,9 +57,131 @@ app = FastAPI(
     docs_url="/docs",
     openapi_url="/openapi.json",
     redoc_url=None,
+    redirect_slashes=False,
+    default_response_class=ORJSONResponse,
+)
+
+
+def extract_headers(scope: Scope) -> dict[str, str]:
+    """
+    Build the headers dict straight from the raw ASGI headers.
+    Repeated headers keep their first value, like Starlette's Headers lookup.
+    """
+    headers: dict[str, str] = {}
+    for key, value in scope["headers"]:
+        headers.setdefault(key.decode("latin-1"), value.decode("latin-1"))
+    return headers
+
+
+def extract_query(scope: Scope) -> dict[str, str]:
+    """
+    Build the query dict straight from the raw query string.
+    Repeated parameters keep their last value, like Starlette's QueryParams.
+    """
+    query_string = scope["query_string"].decode("latin-1")
+    return dict(parse_qsl(query_string, keep_blank_values=True))
+
+
+# The Host header grammar Starlette accepts, a header that doesn't match it
+# is ignored in favour of the server address
+HOST_HEADER_PATTERN = re.compile(
+    r"(?P<host>[a-z0-9._~%!$&'()*+,;=-]+|\[(?:(?P<ipv6>[a-f0-9]*:[a-f0-9.:]+)|"
+    r"(?-i:v)[a-f0-9]+\.[a-z0-9._~!$&'()*+,;=:-]+)\])(?::(?P<port>[0-9]+))?",
+    re.IGNORECASE,
 )
 
 
+def _normalize_hostname(hostname: str) -> str:
+    # urllib only lowercases up to a "%", which could start an IPv6 zone id
+    name, percent, zone = hostname.partition("%")
+    return name.lower() + percent + zone
+
+
+def _parse_host_header(host: str | None) -> str | None:
+    """
+    Get the hostname from a Host header, or None if Starlette would not trust it.
+    """
+    if host is None:
+        return None
+
+    match = HOST_HEADER_PATTERN.fullmatch(host)
+    if match is None:
+        return None
+
+    port = match["port"]
+    if port is not None:
+        port = port.lstrip("0")
+        if len(port) > 5 or int(port or "0") > 65535:
+            return None
+
+    if (ipv6 := match["ipv6"]) is not None:
+        try:
+            IPv6Address(ipv6)
+        except AddressValueError:
+            return None
+
+    return _normalize_hostname(match["host"].removeprefix("[").removesuffix("]"))
+
+
+def extract_host(scope: Scope, headers: dict[str, str]) -> str:
+    """
+    Get the hostname from the Host header, falling back to the server address,
+    without building a URL object for the request.
+    """
+    host = _parse_host_header(headers.get("host"))
+    if host is not None:
+        return host
+
+    server = scope.get("server")
+    return _normalize_hostname(server[0]) if server else ""
+
+
+# Largest body buffer allocated before any of the body has been read
+MAX_PREALLOCATED_BODY_SIZE = 1 << 20
+
+
+async def read_body(request: Request) -> bytes | bytearray:
+    """
+    Read the raw body of the request.
+
+    When the request has a Content-Length the chunks are copied into a buffer
+    allocated up front, instead of being collected and joined. The header is
+    client controlled, so the up front allocation is capped and anything past
+    the cap is collected as it arrives.
+
+    Args:
+        request: The FastAPI request object
+
+    Returns:
+        The raw body content
+    """
+    content_length = request.headers.get("content-length", "")
+    if not content_length.isdecimal() or int(content_length) == 0:
+        return await request.body()
+
+    size = min(int(content_length), MAX_PREALLOCATED_BODY_SIZE)
+    buffer = bytearray(size)
+    offset = 0
+    # Chunks that don't fit in the buffer are kept aside rather than dropped
+    overflow: list[bytes] = []
+
+    with memoryview(buffer) as view:
+        async for chunk in request.stream():
+            end = offset + len(chunk)
+            if overflow or end > size:
+                overflow.append(chunk)
+                continue
+            view[offset:end] = chunk
+            offset = end
+
+    if offset < size:
+        del buffer[offset:]
+    if overflow:
+        buffer += b"".join(overflow)
+
+    return buffer
+
+
 async def extract_body(request: Request) -> str | bytes:
     """
     Extract the body from the request and return as string if possible, otherwise bytes.
@@ -46,18 +192,22 @@ async def extract_body(request: Request) -> str | bytes:
     Returns:
         The body content as string if decodable, otherwise as bytes
     """
-    body_bytes = await request.body()
+    body_bytes = await read_body(request)
 
     # Return empty string if no body
     if not body_bytes:
         return ""
 
+    # ASCII is a subset of UTF-8 and is checked without raising
+    if body_bytes.isascii():
+        return body_bytes.decode("ascii")
+
     # Try to decode as UTF-8 string
     try:
         return body_bytes.decode("utf-8")
     except UnicodeDecodeError:
         # Return raw bytes if can't be decoded
-        return body_bytes
+        return bytes(body_bytes)
 
 
 # --- Endpoints ---
@@ -87,8 +237,9 @@ async def list_requests(mock_server=Resolve(MockApiServer)):
     List all requests that match the given assertion.
     """
     result = await mock_server.list_requests()
+    request_views = MockApiRequestListViewPayload.from_mock_api_requests(result)
 
-    return MockApiRequestListViewPayload.from_mock_api_requests(result)
+    return ORJSONResponse(content=request_views.model_dump(mode="json"))
 
 
 @app.get("/__mock__/stubs")
@@ -99,7 +250,7 @@ async def list_stubs(mock_server=Resolve(MockApiServer)):
     stubs = await mock_server.list_stubs()
     stub_views = StubListViewPayload.from_stubs(stubs)
 
-    return stub_views
+    return ORJSONResponse(content=stub_views.model_dump(mode="json"))
 
 
 @app.api_route(
@@ -110,7 +261,7 @@ async def mock_api_root(request: Request):
     """
     Root endpoint for the mock API server.
     """
-    return JSONResponse(
+    return ORJSONResponse(
         content={
             "message": "Welcome to the Assertive Mock API Server!",
             "available_endpoints": [
@@ -124,21 +275,26 @@ async def mock_api_root(request: Request):
     )
 
 
-@app.api_route(
-    "/{path:path}",
-    methods=["GET", "POST", "PUT", "DELETE", "PATCH", "OPTIONS", "HEAD"],
-    include_in_schema=False,
-)
-async def catch_all(request: Request, mock_server=Resolve(MockApiServer)):
+async def catch_all(scope: Scope, receive: Receive, send: Send) -> None:
     """
-    Catch-all endpoint for all requests.
+    Catch-all handler for all requests that don't match a mock endpoint.
+
+    This is a plain ASGI app used as the router's default, so these requests
+    skip FastAPI's route matching, dependency injection and response handling.
     """
-    headers = dict(request.headers)
-    query = dict(request.query_params)
-    method = request.method
+    if scope["type"] != "http":
+        await app.router.not_found(scope, receive, send)
+        return
+
+    request = Request(scope, receive)
+    mock_server: MockApiServer = request.app.state.mock_server
+
+    headers = extract_headers(scope)
+    query = extract_query(scope)
+    method = scope["method"]
     body = await extract_body(request)
-    hostname = request.url.hostname or ""
-    path = request.url.path
+    hostname = extract_host(scope, headers)
+    path = scope["path"]
 
     api_request = MockApiRequest(
         method=method,
@@ -151,14 +307,25 @@ async def catch_all(request: Request, mock_server=Resolve(MockApiServer)):
 
     api_response = await mock_server.handle_request(api_request)
 
-    # Convert MockApiResponse to FastAPI response
+    try:
+        response = to_response(api_response)
+    finally:
+        mock_server.release_response(api_response)
+
+    await response(scope, receive, send)
+
+
+def to_response(api_response: MockApiResponse) -> Response:
+    """
+    Convert a MockApiResponse to a FastAPI response.
+    """
     content = api_response.body
     status_code = api_response.status_code
     headers = api_response.headers
 
     # Choose response type based on content
     if isinstance(content, dict) or isinstance(content, list):
-        return JSONResponse(content=content, status_code=status_code, headers=headers)
+        return ORJSONResponse(content=content, status_code=status_code, headers=headers)
     elif isinstance(content, str):
         return Response(content=content, status_code=status_code, headers=headers)
     elif isinstance(content, bytes):
@@ -171,3 +338,7 @@ async def catch_all(request: Request, mock_server=Resolve(MockApiServer)):
     else:
         # For None or other types
         return Response(status_code=status_code, headers=headers)
+
+
+# Anything that doesn't match a /__mock__ endpoint is handled by the catch-all
+app.router.default = catch_all
@@ -1,5 +1,14 @@
+import os
+
 from clean_ioc import Container, Lifespan
-from .core import RequestLog, ResponseGenerator, StubRepository, MockApiServer
+from .core import (
+    DEFAULT_REQUEST_LOG_MAX_SIZE,
+    MockApiResponsePool,
+    RequestLog,
+    ResponseGenerator,
+    StubRepository,
+    MockApiServer,
+)
 import httpx
 
 
@@ -8,6 +17,15 @@ async def async_client_factory():
         yield client
 
 
+def request_log_factory():
+    max_size = int(
+        os.environ.get("MOCK_REQUEST_LOG_MAX", str(DEFAULT_REQUEST_LOG_MAX_SIZE))
+    )
+    if max_size < 1:
+        raise ValueError(f"MOCK_REQUEST_LOG_MAX must be at least 1, got {max_size}")
+    return RequestLog(max_size=max_size)
+
+
 def get_container():
     """
     Create a container for dependency injection.
@@ -16,8 +34,13 @@ def get_container():
 
     container.register(MockApiServer, lifespan=Lifespan.singleton)
     container.register(StubRepository, lifespan=Lifespan.singleton)
-    container.register(RequestLog, lifespan=Lifespan.singleton)
+    container.register(
+        RequestLog,
+        lifespan=Lifespan.singleton,
+        factory=request_log_factory,
+    )
     container.register(ResponseGenerator, lifespan=Lifespan.singleton)
+    container.register(MockApiResponsePool, lifespan=Lifespan.singleton)
     container.register(
         httpx.AsyncClient,
         lifespan=Lifespan.singleton,
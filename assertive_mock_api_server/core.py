@@ -2,8 +2,14 @@
 This is a test bed for the assertive-mock-api.
 """
 
+from collections import ChainMap, deque
+from collections.abc import Iterable, Mapping
+from heapq import merge
+from operator import itemgetter
+from threading import Lock
+from types import MappingProxyType
 from typing import Any
-from assertive import Criteria, is_gte
+from assertive import Criteria, is_eq, is_gt, is_gte, is_lt, is_lte
 from pydantic import model_validator
 import httpx
 
@@ -12,8 +18,24 @@ from dataclasses import dataclass, field
 
 PRACTICALLY_INFINITE = 2**31
 
+DEFAULT_REQUEST_LOG_MAX_SIZE = 100_000
 
-@dataclass(kw_only=True)
+MATCH_FIELDS = ("method", "path", "headers", "body", "host", "query")
+
+
+def _build_checks(source: Any) -> tuple[tuple[str, Criteria], ...]:
+    """
+    Builds the (field, criteria) pairs that a request has to satisfy,
+    skipping the fields that are not constrained.
+    """
+    return tuple(
+        (name, criteria)
+        for name in MATCH_FIELDS
+        if (criteria := getattr(source, name)) is not None
+    )
+
+
+@dataclass(kw_only=True, slots=True)
 class MockApiRequest:
     path: str
     method: str
@@ -23,7 +45,28 @@ class MockApiRequest:
     query: dict
 
 
-@dataclass(kw_only=True)
+def _count_bounds(times: Criteria) -> tuple[int | None, int | None]:
+    """
+    Returns the counts at which a simple times criteria is known to pass and to fail,
+    so counting can stop early. None means counting has to run to the end.
+    """
+    value = getattr(times, "value", None)
+    if not isinstance(value, int) or isinstance(value, bool):
+        return None, None
+
+    times_type = type(times)
+    if times_type is is_gte:
+        return value, None
+    if times_type is is_gt:
+        return value + 1, None
+    if times_type is is_eq or times_type is is_lte:
+        return None, value + 1
+    if times_type is is_lt:
+        return None, value
+    return None, None
+
+
+@dataclass(kw_only=True, slots=True)
 class ApiAssertion:
     path: Criteria | None = None
     method: Criteria | None = None
@@ -33,28 +76,38 @@ class ApiAssertion:
     query: Criteria | None = None
     times: Criteria = field(default_factory=lambda: is_gte(1))
 
-    class Config:
-        arbitrary_types_allowed = True
+    _checks: tuple[tuple[str, Criteria], ...] = field(
+        init=False, repr=False, compare=False
+    )
+
+    def __post_init__(self):
+        self._checks = _build_checks(self)
 
     def _matches_request(self, request: MockApiRequest) -> bool:
         """
         Check if the request matches the stub.
         """
-
-        fields_to_check = ["method", "path", "headers", "body", "host", "query"]
-        for check in fields_to_check:
-            if getattr(self, check) is not None:
-                if getattr(request, check) != getattr(self, check):
-                    return False
+        for name, criteria in self._checks:
+            if getattr(request, name) != criteria:
+                return False
         return True
 
-    def matches_requests(self, requests: list[MockApiRequest]) -> bool:
-        matches = [request for request in requests if self._matches_request(request)]
+    def matches_requests(self, requests: Iterable[MockApiRequest]) -> bool:
+        enough, too_many = _count_bounds(self.times)
+
+        count = 0
+        for request in requests:
+            if self._matches_request(request):
+                count += 1
+                if count == enough:
+                    return True
+                if count == too_many:
+                    return False
 
-        return len(matches) == self.times
+        return count == self.times
 
 
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, slots=True)
 class StubRequest:
     """
     A stub request object for testing purposes.
@@ -67,11 +120,8 @@ class StubRequest:
     host: Criteria | None = None
     query: Criteria | None = None
 
-    class Config:
-        arbitrary_types_allowed = True
 
-
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, slots=True)
 class StubResponse:
     """
     A stub response object for testing purposes.
@@ -81,11 +131,8 @@ class StubResponse:
     headers: dict
     body: Any
 
-    class Config:
-        arbitrary_types_allowed = True
-
 
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, slots=True)
 class StubProxy:
     """
     A stub proxy object for testing purposes.
@@ -95,11 +142,17 @@ class StubProxy:
     headers: dict = field(default_factory=dict)
     timeout: int = 5
 
-    class Config:
-        arbitrary_types_allowed = True
+    # Read-only httpx request extensions, built from timeout when the proxy is created
+    request_extensions: Mapping[str, Any] = field(init=False, repr=False, compare=False)
 
+    def __post_init__(self):
+        # httpx uses a timeout given in the request extensions as is, rather than
+        # building and converting a Timeout for every proxied request
+        timeout = MappingProxyType(httpx.Timeout(self.timeout).as_dict())
+        self.request_extensions = MappingProxyType({"timeout": timeout})
 
-@dataclass(kw_only=True)
+
+@dataclass(kw_only=True, slots=True)
 class StubAction:
     """
     A stub action object for testing purposes.
@@ -119,17 +172,14 @@ class StubAction:
             raise ValueError("Only one of response or proxy can be provided.")
         return self
 
-    class Config:
-        arbitrary_types_allowed = True
-
 
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, slots=True)
 class StubMatch:
     strength: int
     stub: "Stub"
 
 
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, slots=True)
 class Stub:
     """
     A stub object for testing purposes.
@@ -141,29 +191,35 @@ class Stub:
     call_count: int = 0
     max_calls: int = PRACTICALLY_INFINITE
 
-    def matches_request(self, request: MockApiRequest) -> StubMatch:
+    _checks: tuple[tuple[str, Criteria], ...] = field(
+        init=False, repr=False, compare=False
+    )
+    _strength_max: int = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self._checks = _build_checks(self.request)
+        self._strength_max = len(self._checks)
+
+    def matches_request(self, request: MockApiRequest) -> StubMatch | None:
         """
         Check if the request matches the stub.
+        Returns None if the stub does not match or has been used up.
+        Matching does not count as a call, see StubRepository.find_best_match.
         """
         if self.call_count >= self.max_calls:
-            return StubMatch(strength=0, stub=self)
-
-        strength = 0
-        fields_to_check = ["method", "path", "headers", "body", "host", "query"]
+            return None
 
-        for check_field in fields_to_check:
-            if getattr(self.request, check_field) is not None:
-                if getattr(request, check_field) != getattr(self.request, check_field):
-                    return StubMatch(strength=0, stub=self)
-                strength += 1
+        for name, criteria in self._checks:
+            if getattr(request, name) != criteria:
+                return None
 
-        self.call_count += 1
-        return StubMatch(strength=strength, stub=self)
+        return StubMatch(strength=self._strength_max, stub=self)
 
 
 class RequestLog:
-    def __init__(self):
-        self.requests: list[MockApiRequest] = []
+    def __init__(self, max_size: int = DEFAULT_REQUEST_LOG_MAX_SIZE):
+        # Once full, the oldest requests are dropped to make room for new ones
+        self.requests: deque[MockApiRequest] = deque(maxlen=max_size)
 
     def add(self, request: MockApiRequest) -> None:
         """
@@ -173,33 +229,116 @@ class RequestLog:
 
     def get_requests(self) -> list[MockApiRequest]:
         """
-        Finds all requests that match the given assertion.
+        Returns a snapshot of the logged requests.
         """
-        return self.requests
+        return list(self.requests)
+
+
+def _literal_value(criteria: Criteria | None) -> str | None:
+    """
+    Returns the literal string a criteria matches, if it is a plain equality check.
+    """
+    if type(criteria) is is_eq and isinstance(criteria.value, str):
+        return criteria.value
+    return None
+
+
+@dataclass(frozen=True, slots=True)
+class _StubIndex:
+    """
+    An immutable snapshot of the stubs and their lookup indexes.
+    """
+
+    stubs: tuple[Stub, ...] = ()
+    # Stubs are indexed by their literal method/path so that only candidates
+    # need to be scanned. Entries keep their insertion position for tie-breaks.
+    by_method_path: dict[tuple[str, str], tuple[tuple[int, Stub], ...]] = field(
+        default_factory=dict
+    )
+    by_path: dict[str, tuple[tuple[int, Stub], ...]] = field(default_factory=dict)
+    wildcard: tuple[tuple[int, Stub], ...] = ()
+    # Highest strength any stub can reach, a match this strong can't be beaten
+    max_strength: int = 0
 
 
 class StubRepository:
     def __init__(self):
-        self.stubs: list[Stub] = []
+        # Every add builds a new index and swaps it in with a single assignment,
+        # the dicts in an index are never mutated once it has been published.
+        # Readers take the index once and see the stubs and indexes together.
+        # Stub.call_count is not part of the index and isn't synchronized.
+        self._index = _StubIndex()
+        self._write_lock = Lock()
+
+    @property
+    def stubs(self) -> tuple[Stub, ...]:
+        """
+        The stubs in the order they were added, use add to add a stub.
+        """
+        return self._index.stubs
 
     def add(self, stub: Stub) -> None:
         """
         Adds a stub to the repository.
         """
-        self.stubs.append(stub)
+        method = _literal_value(stub.request.method)
+        path = _literal_value(stub.request.path)
+
+        with self._write_lock:
+            index = self._index
+            entry = (len(index.stubs), stub)
+            by_method_path = index.by_method_path
+            by_path = index.by_path
+            wildcard = index.wildcard
+
+            if path is None:
+                wildcard = wildcard + (entry,)
+            elif method is None:
+                by_path = {**by_path, path: by_path.get(path, ()) + (entry,)}
+            else:
+                key = (method, path)
+                by_method_path = {
+                    **by_method_path,
+                    key: by_method_path.get(key, ()) + (entry,),
+                }
+
+            self._index = _StubIndex(
+                stubs=index.stubs + (stub,),
+                by_method_path=by_method_path,
+                by_path=by_path,
+                wildcard=wildcard,
+                max_strength=max(index.max_strength, stub._strength_max),
+            )
 
     def find_best_match(self, request: MockApiRequest) -> Stub | None:
         """
-        Finds the best match for the given request.
+        Finds the best match for the given request and counts it as a call.
+        The strongest match wins, ties go to the most recently added stub.
         """
+        index = self._index
         best_match = None
-        best_strength = 0
+        best_strength = -1
+
+        # Newest first, so the first stub to reach a strength wins its ties
+        candidates = merge(
+            reversed(index.by_method_path.get((request.method, request.path), ())),
+            reversed(index.by_path.get(request.path, ())),
+            reversed(index.wildcard),
+            key=itemgetter(0),
+            reverse=True,
+        )
 
-        for stub in self.stubs:
+        for _, stub in candidates:
             match = stub.matches_request(request)
-            if match.strength >= best_strength:
-                best_strength = match.strength
-                best_match = match.stub
+            if match is None or match.strength <= best_strength:
+                continue
+            best_strength = match.strength
+            best_match = match.stub
+            if best_strength == index.max_strength:
+                break
+
+        if best_match is not None:
+            best_match.call_count += 1
 
         return best_match
 
@@ -207,13 +346,10 @@ class StubRepository:
         """
         Lists all stubs in the repository.
         """
-        return self.stubs
-
-    class Config:
-        arbitrary_types_allowed = True
+        return list(self.stubs)
 
 
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, slots=True)
 class MockApiResponse:
     status_code: int
     headers: dict
@@ -231,28 +367,61 @@ class MockApiResponse:
         )
 
 
+class MockApiResponsePool:
+    """
+    A free list of responses, so response objects can be reused once they are sent.
+    """
+
+    def __init__(self, max_size: int = 1024):
+        self.max_size = max_size
+        self._free: list[MockApiResponse] = []
+
+    def acquire(self, *, status_code: int, headers: dict, body: Any) -> MockApiResponse:
+        """
+        Returns a pooled response with the given values, or a new one if the pool is empty.
+        """
+        if not self._free:
+            return MockApiResponse(status_code=status_code, headers=headers, body=body)
+
+        response = self._free.pop()
+        response.status_code = status_code
+        response.headers = headers
+        response.body = body
+        return response
+
+    def release(self, response: MockApiResponse) -> None:
+        """
+        Returns a response to the pool. The response must not be used afterwards.
+        """
+        if len(self._free) < self.max_size:
+            # Don't keep large bodies alive while the response sits in the pool
+            response.body = None
+            self._free.append(response)
+
+
 class ResponseGenerator:
     """
     A generator for creating responses.
     """
 
-    def __init__(self, client: httpx.AsyncClient):
+    def __init__(self, client: httpx.AsyncClient, response_pool: MockApiResponsePool):
         self.client = client
+        self.response_pool = response_pool
 
     async def generate(self, stub: Stub, request: MockApiRequest) -> MockApiResponse:
         """
         Generates a response.
         """
         if stub_response := stub.action.response:
-            return MockApiResponse(
+            return self.response_pool.acquire(
                 status_code=stub_response.status_code,
                 headers=stub_response.headers,
                 body=stub_response.body,
             )
 
         if stub_proxy := stub.action.proxy:
-            headers = request.headers.copy()
-            headers.update(stub_proxy.headers)
+            # Proxy headers take precedence over the request's, without copying either
+            headers = ChainMap(stub_proxy.headers, request.headers)
 
             proxied_response = await self.client.request(
                 method=request.method,
@@ -260,10 +429,10 @@ class ResponseGenerator:
                 headers=headers,
                 data=request.body,
                 params=request.query,
-                timeout=stub_proxy.timeout,
+                extensions=stub_proxy.request_extensions,
             )
 
-            return MockApiResponse(
+            return self.response_pool.acquire(
                 status_code=proxied_response.status_code,
                 headers=dict(proxied_response.headers),
                 body=proxied_response.content,
@@ -272,7 +441,7 @@ class ResponseGenerator:
         raise ValueError("No response or proxy found in the stub.")
 
 
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, slots=True)
 class ConfirmResult:
     """
     A result object for the conform method.
@@ -308,6 +477,12 @@ class MockApiServer:
         response = await self.response_generator.generate(best_match, request)
         return response
 
+    def release_response(self, response: MockApiResponse) -> None:
+        """
+        Releases a response returned by handle_request once it has been sent.
+        """
+        self.response_generator.response_pool.release(response)
+
     async def add_stub(self, stub: Stub) -> None:
         """
         Stubs a request with the given parameters.
@@ -315,8 +490,8 @@ class MockApiServer:
         self.stub_repository.add(stub)
 
     async def confirm_assertion(self, assertion: ApiAssertion) -> ConfirmResult:
-        requests = self.request_log.get_requests()
-        result = assertion.matches_requests(requests)
+        # Iterates the log itself, a copy would cost O(all requests) per assertion
+        result = assertion.matches_requests(self.request_log.requests)
         return ConfirmResult(success=result)
 
     async def list_stubs(self) -> list[Stub]:
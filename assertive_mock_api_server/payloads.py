@@ -1,3 +1,6 @@
+import json
+from functools import lru_cache
+from collections.abc import Callable
 from typing import Any
 from assertive import Criteria, ensure_criteria, has_key_values
 from assertive.serialize import deserialize, serialize
@@ -14,12 +17,45 @@ from .core import (
 )
 
 
-def ensure_str_criteria(data: str | dict | Criteria) -> Criteria:
+class _CriteriaCacheKey:
+    """
+    A hashable key for raw criteria data that keeps the data it was made from,
+    so a cache miss builds the criteria from the original rather than a copy
+    decoded from the key.
+    """
+
+    __slots__ = ("key", "data")
+
+    def __init__(self, key: str, data: Any):
+        self.key = key
+        self.data = data
+
+    def __hash__(self) -> int:
+        return hash(self.key)
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, _CriteriaCacheKey) and self.key == other.key
+
+
+def _criteria_cache_key(data: Any) -> _CriteriaCacheKey | None:
+    """
+    Returns a hashable key for raw criteria data, or None if it can't be cached.
+    """
+    if isinstance(data, Criteria):
+        return None
+    try:
+        # json keeps NaN and Infinity apart from null, which orjson doesn't
+        return _CriteriaCacheKey(json.dumps(data, sort_keys=True), data)
+    except (TypeError, ValueError):
+        return None
+
+
+def _to_str_criteria(data: Any) -> Criteria:
     item = deserialize(data)
     return ensure_criteria(item)
 
 
-def ensure_dict_criteria(data: dict | Criteria) -> Criteria:
+def _to_dict_criteria(data: Any) -> Criteria:
     item = deserialize(data)
 
     if isinstance(item, dict):
@@ -28,6 +64,38 @@ def ensure_dict_criteria(data: dict | Criteria) -> Criteria:
     return ensure_criteria(item)
 
 
+# Criteria are only read once built, so payloads that are posted repeatedly
+# can share them rather than being deserialized again.
+@lru_cache(maxsize=1024)
+def _cached_str_criteria(key: _CriteriaCacheKey) -> Criteria:
+    return _to_str_criteria(key.data)
+
+
+@lru_cache(maxsize=1024)
+def _cached_dict_criteria(key: _CriteriaCacheKey) -> Criteria:
+    return _to_dict_criteria(key.data)
+
+
+def ensure_str_criteria(data: str | dict | Criteria) -> Criteria:
+    key = _criteria_cache_key(data)
+    if key is None:
+        return _to_str_criteria(data)
+    return _cached_str_criteria(key)
+
+
+def ensure_dict_criteria(data: dict | Criteria) -> Criteria:
+    key = _criteria_cache_key(data)
+    if key is None:
+        return _to_dict_criteria(data)
+    return _cached_dict_criteria(key)
+
+
+def _optional_criteria(
+    ensure: Callable[[Any], Criteria], data: Any | None
+) -> Criteria | None:
+    return ensure(data) if data is not None else None
+
+
 class ApiAssertionPayload(BaseModel):
     """
     A request object for stubbing.
@@ -45,33 +113,20 @@ class ApiAssertionPayload(BaseModel):
         """
         Convert the request object to an ApiAssertion.
         """
+        assertion = ApiAssertion(
+            method=_optional_criteria(ensure_str_criteria, self.method),
+            path=_optional_criteria(ensure_str_criteria, self.path),
+            body=_optional_criteria(ensure_str_criteria, self.body),
+            host=_optional_criteria(ensure_str_criteria, self.host),
+            headers=_optional_criteria(ensure_dict_criteria, self.headers),
+            query=_optional_criteria(ensure_dict_criteria, self.query),
+        )
 
-        kwargs = {}
-
+        # Only override the default times when the payload sets it
         if self.times is not None:
-            kwargs["times"] = ensure_str_criteria(self.times)
-
-        if self.path is not None:
-            kwargs["path"] = ensure_str_criteria(self.path)
-
-        if self.method is not None:
-            kwargs["method"] = ensure_str_criteria(self.method)
-
-        if self.body is not None:
-            kwargs["body"] = ensure_str_criteria(self.body)
+            assertion.times = ensure_str_criteria(self.times)
 
-        if self.host is not None:
-            kwargs["host"] = ensure_str_criteria(self.host)
-
-        if self.headers is not None:
-            kwargs["headers"] = ensure_dict_criteria(self.headers)
-
-        if self.query is not None:
-            kwargs["query"] = ensure_dict_criteria(self.query)
-
-        return ApiAssertion(
-            **kwargs,
-        )
+        return assertion
 
 
 class StubProxyPayload(BaseModel):
@@ -88,7 +143,7 @@ class StubProxyPayload(BaseModel):
         """
         Convert a stub proxy to a stub proxy payload.
         """
-        return cls(
+        return cls.model_construct(
             url=proxy.url,
             headers=proxy.headers,
             timeout=proxy.timeout,
@@ -98,12 +153,7 @@ class StubProxyPayload(BaseModel):
         """
         Convert the proxy object to a stub proxy.
         """
-
-        return StubProxy(
-            url=self.url,
-            headers=self.headers,
-            timeout=self.timeout,
-        )
+        return StubProxy(url=self.url, headers=self.headers, timeout=self.timeout)
 
 
 class StubResponsePayload(BaseModel):
@@ -120,7 +170,7 @@ class StubResponsePayload(BaseModel):
         """
         Convert a stub response to a stub response payload.
         """
-        return cls(
+        return cls.model_construct(
             status_code=response.status_code,
             headers=response.headers,
             body=response.body,
@@ -130,11 +180,8 @@ class StubResponsePayload(BaseModel):
         """
         Convert the response object to a stub response.
         """
-
         return StubResponse(
-            status_code=self.status_code,
-            headers=self.headers,
-            body=self.body,
+            status_code=self.status_code, headers=self.headers, body=self.body
         )
 
 
@@ -155,7 +202,7 @@ class StubRequestPayload(BaseModel):
         """
         Convert a request object to a stub request payload.
         """
-        return cls(
+        return cls.model_construct(
             method=serialize(request.method) if request.method else None,
             path=serialize(request.path) if request.path else None,
             body=serialize(request.body) if request.body else None,
@@ -168,28 +215,13 @@ class StubRequestPayload(BaseModel):
         """
         Convert the rough request object to a stub request.
         """
-        kwargs = {}
-
-        if self.path is not None:
-            kwargs["path"] = ensure_str_criteria(self.path)
-
-        if self.method is not None:
-            kwargs["method"] = ensure_str_criteria(self.method)
-
-        if self.body is not None:
-            kwargs["body"] = ensure_str_criteria(self.body)
-
-        if self.host is not None:
-            kwargs["host"] = ensure_str_criteria(self.host)
-
-        if self.headers is not None:
-            kwargs["headers"] = ensure_dict_criteria(self.headers)
-
-        if self.query is not None:
-            kwargs["query"] = ensure_dict_criteria(self.query)
-
         return StubRequest(
-            **kwargs,
+            method=_optional_criteria(ensure_str_criteria, self.method),
+            path=_optional_criteria(ensure_str_criteria, self.path),
+            body=_optional_criteria(ensure_str_criteria, self.body),
+            host=_optional_criteria(ensure_str_criteria, self.host),
+            headers=_optional_criteria(ensure_dict_criteria, self.headers),
+            query=_optional_criteria(ensure_dict_criteria, self.query),
         )
 
 
@@ -206,7 +238,7 @@ class StubActionPayload(BaseModel):
         """
         Convert a stub action to a stub action payload.
         """
-        return cls(
+        return cls.model_construct(
             response=StubResponsePayload.from_stub_response(action.response)
             if action.response
             else None,
@@ -219,7 +251,6 @@ class StubActionPayload(BaseModel):
         """
         Convert the action object to a stub action.
         """
-
         return StubAction(
             response=self.response.to_stub_response() if self.response else None,
             proxy=self.proxy.to_stub_proxy() if self.proxy else None,
@@ -239,18 +270,16 @@ class StubPayload(BaseModel):
         """
         Convert the request object to a stub.
         """
+        stub = Stub(
+            request=self.request.to_stub_request(),
+            action=self.action.to_stub_action(),
+        )
 
-        kwargs = {
-            "request": self.request.to_stub_request(),
-            "action": self.action.to_stub_action(),
-        }
-
+        # Only override the default max_calls when the payload sets it
         if self.max_calls is not None:
-            kwargs["max_calls"] = self.max_calls
+            stub.max_calls = self.max_calls
 
-        return Stub(
-            **kwargs,
-        )
+        return stub
 
 
 class StubViewPayload(BaseModel):
@@ -273,10 +302,11 @@ class StubListViewPayload(BaseModel):
     def from_stubs(cls, stubs: list[Stub]) -> "StubListViewPayload":
         """
         Convert a list of stubs to a list of stub views.
+        The views are built without validation, as they come from stubs the server holds.
         """
-        return cls(
+        return cls.model_construct(
             stubs=[
-                StubViewPayload(
+                StubViewPayload.model_construct(
                     request=StubRequestPayload.from_stub_request(stub.request),
                     action=StubActionPayload.from_stub_action(stub.action),
                 )
@@ -304,7 +334,7 @@ class MockApiRequestViewPayload(BaseModel):
         """
         Convert a mock API request to a view payload.
         """
-        return cls(
+        return cls.model_construct(
             method=request.method,
             path=request.path,
             query=request.query,
@@ -327,8 +357,9 @@ class MockApiRequestListViewPayload(BaseModel):
     ) -> "MockApiRequestListViewPayload":
         """
         Convert a list of mock API requests to a view payload.
+        The views are built without validation, as they come from the request log.
         """
-        return cls(
+        return cls.model_construct(
             requests=[
                 MockApiRequestViewPayload.from_mock_api_request(request)
                 for request in requests
@@ -0,0 +1,12 @@
+from assertive_mock_api_server.core import MockApiRequest
+
+
+def make_request(path: str) -> MockApiRequest:
+    return MockApiRequest(
+        path=path,
+        method="GET",
+        headers={},
+        body=None,
+        host="localhost",
+        query={},
+    )
@@ -0,0 +1,63 @@
+from assertive import is_eq, is_gte, is_lt
+
+from assertive_mock_api_server.core import ApiAssertion
+
+from .helpers import make_request
+
+
+REQUESTS = [make_request("/test"), make_request("/other"), make_request("/test")]
+
+
+class TestApiAssertion:
+    def test_matches_requests_default_times(self):
+        # Setup
+        assertion = ApiAssertion(path=is_eq("/test"))
+
+        # Execute
+        result = assertion.matches_requests(REQUESTS)
+
+        # Assert
+        assert result is True
+
+    def test_matches_requests_no_matches(self):
+        # Setup
+        assertion = ApiAssertion(path=is_eq("/missing"), times=is_gte(1))
+
+        # Execute
+        result = assertion.matches_requests(REQUESTS)
+
+        # Assert
+        assert result is False
+
+    def test_matches_requests_exact_times(self):
+        # Setup
+        exact = ApiAssertion(path=is_eq("/test"), times=is_eq(2))
+        too_few = ApiAssertion(path=is_eq("/test"), times=is_eq(1))
+
+        # Execute
+        exact_result = exact.matches_requests(REQUESTS)
+        too_few_result = too_few.matches_requests(REQUESTS)
+
+        # Assert
+        assert exact_result is True
+        assert too_few_result is False
+
+    def test_matches_requests_upper_bound(self):
+        # Setup
+        assertion = ApiAssertion(path=is_eq("/test"), times=is_lt(2))
+
+        # Execute
+        result = assertion.matches_requests(REQUESTS)
+
+        # Assert
+        assert result is False
+
+    def test_matches_requests_range_times(self):
+        # Setup
+        assertion = ApiAssertion(path=is_eq("/test"), times=is_gte(2) & is_lt(4))
+
+        # Execute
+        result = assertion.matches_requests(REQUESTS)
+
+        # Assert
+        assert result is True
@@ -0,0 +1,272 @@
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+from starlette.requests import Request
+from starlette.websockets import WebSocketDisconnect
+
+from assertive_mock_api_server.app import (
+    MAX_PREALLOCATED_BODY_SIZE,
+    app,
+    extract_headers,
+    extract_host,
+    extract_query,
+    read_body,
+)
+
+
+def make_scope(
+    headers: list[tuple[bytes, bytes]],
+    query_string: bytes = b"",
+    server: tuple[str, int] | None = None,
+) -> dict:
+    return {
+        "type": "http",
+        "scheme": "http",
+        "method": "POST",
+        "path": "/test",
+        "query_string": query_string,
+        "headers": headers,
+        "server": server,
+    }
+
+
+def make_http_request(
+    chunks: list[bytes], headers: list[tuple[bytes, bytes]]
+) -> Request:
+    messages = [
+        {"type": "http.request", "body": chunk, "more_body": True} for chunk in chunks
+    ]
+    messages.append({"type": "http.request", "body": b"", "more_body": False})
+
+    async def receive():
+        return messages.pop(0)
+
+    return Request(make_scope(headers), receive)
+
+
+class TestReadBody:
+    def test_read_body_matching_content_length(self):
+        # Setup
+        request = make_http_request([b"abc", b"def"], [(b"content-length", b"6")])
+
+        # Execute
+        body = asyncio.run(read_body(request))
+
+        # Assert
+        assert body == b"abcdef"
+
+    def test_read_body_body_shorter_than_content_length(self):
+        # Setup
+        request = make_http_request([b"abc"], [(b"content-length", b"200000000000")])
+
+        # Execute
+        body = asyncio.run(read_body(request))
+
+        # Assert
+        assert body == b"abc"
+
+    def test_read_body_body_longer_than_content_length(self):
+        # Setup
+        request = make_http_request([b"abc", b"def"], [(b"content-length", b"4")])
+
+        # Execute
+        body = asyncio.run(read_body(request))
+
+        # Assert
+        assert body == b"abcdef"
+
+    def test_read_body_body_longer_than_preallocated_buffer(self):
+        # Setup
+        chunk = b"x" * MAX_PREALLOCATED_BODY_SIZE
+        size = str(2 * MAX_PREALLOCATED_BODY_SIZE).encode()
+        request = make_http_request([chunk, chunk], [(b"content-length", size)])
+
+        # Execute
+        body = asyncio.run(read_body(request))
+
+        # Assert
+        assert body == chunk + chunk
+
+    def test_read_body_missing_content_length(self):
+        # Setup
+        request = make_http_request([b"abc", b"def"], [])
+
+        # Execute
+        body = asyncio.run(read_body(request))
+
+        # Assert
+        assert body == b"abcdef"
+
+    def test_read_body_invalid_content_length(self):
+        # Setup
+        request = make_http_request(
+            [b"abc"], [(b"content-length", "\xb2".encode("latin-1"))]
+        )
+
+        # Execute
+        body = asyncio.run(read_body(request))
+
+        # Assert
+        assert body == b"abc"
+
+
+class TestExtractHeadersAndQuery:
+    def test_duplicates_match_starlette(self):
+        # Setup
+        scope = make_scope(
+            [(b"x-dup", b"first"), (b"accept", b"*/*"), (b"x-dup", b"second")],
+            query_string=b"a=1&b=&a=2&c=%20x",
+        )
+        request = Request(scope)
+
+        # Execute
+        headers = extract_headers(scope)
+        query = extract_query(scope)
+
+        # Assert
+        assert headers == dict(request.headers)
+        assert query == dict(request.query_params)
+        assert headers["x-dup"] == "first"
+        assert query["a"] == "2"
+
+
+class TestExtractHost:
+    @pytest.mark.parametrize(
+        "headers, server",
+        [
+            ([(b"host", b"example.com:8910")], None),
+            ([(b"host", b"Example.COM")], None),
+            ([(b"host", b"[::1]:8910")], None),
+            ([], ("10.0.0.1", 8910)),
+            ([(b"host", b"example.com:abc")], ("10.0.0.1", 8910)),
+            ([(b"host", b"example.com:99999")], ("10.0.0.1", 8910)),
+            ([(b"host", b"example.com:00080")], ("10.0.0.1", 8910)),
+            ([(b"host", b"user@example.com")], ("10.0.0.1", 8910)),
+            ([(b"host", b"[::g]:8910")], ("10.0.0.1", 8910)),
+            ([(b"host", b"")], ("10.0.0.1", 8910)),
+        ],
+    )
+    def test_extract_host_matches_starlette(self, headers, server):
+        # Setup
+        scope = make_scope(headers, server=server)
+        request = Request(scope)
+
+        # Execute
+        host = extract_host(scope, extract_headers(scope))
+
+        # Assert
+        assert host == request.url.hostname
+
+
+@pytest.fixture
+def client():
+    with TestClient(app) as client:
+        yield client
+
+
+def add_stub(client: TestClient, method: str, path: str) -> None:
+    response = client.post(
+        "/__mock__/stubs",
+        json={
+            "request": {"method": method, "path": path},
+            "action": {
+                "response": {"status_code": 201, "headers": {}, "body": {"ok": True}}
+            },
+        },
+    )
+    assert response.status_code == 200
+
+
+class TestCatchAll:
+    def test_stub_round_trip(self, client: TestClient):
+        # Setup
+        add_stub(client, "POST", "/things")
+
+        # Execute
+        response = client.post("/things?page=2", content=b"hello")
+        requests = client.get("/__mock__/requests").json()["requests"]
+        assertion = client.post(
+            "/__mock__/assert",
+            json={"method": "POST", "path": "/things", "body": "hello"},
+        )
+
+        # Assert
+        assert response.status_code == 201
+        assert response.json() == {"ok": True}
+        assert len(requests) == 1
+        assert requests[0]["method"] == "POST"
+        assert requests[0]["path"] == "/things"
+        assert requests[0]["query"] == {"page": "2"}
+        assert requests[0]["body"] == "hello"
+        assert assertion.json() == {"result": True}
+
+    def test_json_body_orjson_cannot_encode(self, client: TestClient):
+        # Setup
+        big_number = 12345678901234567890123
+        client.post(
+            "/__mock__/stubs",
+            json={
+                "request": {"path": "/big"},
+                "action": {
+                    "response": {
+                        "status_code": 200,
+                        "headers": {},
+                        "body": {"id": big_number},
+                    }
+                },
+            },
+        )
+
+        # Execute
+        response = client.get("/big")
+        stubs = client.get("/__mock__/stubs")
+
+        # Assert
+        assert response.status_code == 200
+        assert response.json() == {"id": big_number}
+        assert stubs.status_code == 200
+        assert stubs.json()["stubs"][0]["action"]["response"]["body"] == {
+            "id": big_number
+        }
+
+    def test_no_stub_found(self, client: TestClient):
+        # Execute
+        response = client.get("/missing")
+
+        # Assert
+        assert response.status_code == 404
+        assert response.text == "NO_STUB_MATCH_FOUND"
+
+    def test_any_method_reaches_stubs(self, client: TestClient):
+        # Setup
+        add_stub(client, "PROPFIND", "/things")
+
+        # Execute
+        response = client.request("PROPFIND", "/things")
+
+        # Assert
+        assert response.status_code == 201
+
+    def test_wrong_method_on_mock_endpoint(self, client: TestClient):
+        # Execute
+        response = client.put("/__mock__/stubs")
+
+        # Assert
+        assert response.status_code == 405
+
+    def test_trailing_slash_is_not_redirected(self, client: TestClient):
+        # Setup
+        add_stub(client, "GET", "/__mock__/stubs/")
+
+        # Execute
+        response = client.get("/__mock__/stubs/", follow_redirects=False)
+
+        # Assert
+        assert response.status_code == 201
+
+    def test_websocket_is_not_found(self, client: TestClient):
+        # Execute / Assert
+        with pytest.raises(WebSocketDisconnect):
+            with client.websocket_connect("/socket"):
+                pass
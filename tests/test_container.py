@@ -0,0 +1,37 @@
+import pytest
+
+from assertive_mock_api_server.container import request_log_factory
+from assertive_mock_api_server.core import DEFAULT_REQUEST_LOG_MAX_SIZE
+
+
+class TestRequestLogFactory:
+    def test_uses_default_max_size(self, monkeypatch: pytest.MonkeyPatch):
+        # Setup
+        monkeypatch.delenv("MOCK_REQUEST_LOG_MAX", raising=False)
+
+        # Execute
+        request_log = request_log_factory()
+
+        # Assert
+        assert request_log.requests.maxlen == DEFAULT_REQUEST_LOG_MAX_SIZE
+
+    def test_reads_max_size_from_environment(self, monkeypatch: pytest.MonkeyPatch):
+        # Setup
+        monkeypatch.setenv("MOCK_REQUEST_LOG_MAX", "5")
+
+        # Execute
+        request_log = request_log_factory()
+
+        # Assert
+        assert request_log.requests.maxlen == 5
+
+    @pytest.mark.parametrize("max_size", ["0", "-1"])
+    def test_rejects_max_size_below_one(
+        self, monkeypatch: pytest.MonkeyPatch, max_size: str
+    ):
+        # Setup
+        monkeypatch.setenv("MOCK_REQUEST_LOG_MAX", max_size)
+
+        # Execute / Assert
+        with pytest.raises(ValueError, match="MOCK_REQUEST_LOG_MAX"):
+            request_log_factory()
@@ -0,0 +1,114 @@
+from assertive import is_lte
+
+from assertive_mock_api_server.payloads import (
+    ApiAssertionPayload,
+    StubPayload,
+    ensure_dict_criteria,
+    ensure_str_criteria,
+)
+
+PAYLOAD = {
+    "request": {
+        "method": "GET",
+        "path": {"$eq": {"value": "/test"}},
+        "headers": {"a": "b"},
+    },
+    "action": {"response": {"status_code": 200, "headers": {}, "body": "test"}},
+}
+
+
+class TestStubPayload:
+    def test_to_stub(self):
+        # Setup
+        payload = StubPayload.model_validate({**PAYLOAD, "max_calls": 2})
+
+        # Execute
+        stub = payload.to_stub()
+
+        # Assert
+        assert stub.max_calls == 2
+        assert stub.request.body is None
+        assert "GET" == stub.request.method
+        assert stub.action.proxy is None
+        assert stub.action.response is not None
+        assert stub.action.response.body == "test"
+
+    def test_to_stub_reuses_criteria_for_repeated_payloads(self):
+        # Setup
+        first = StubPayload.model_validate(PAYLOAD)
+        second = StubPayload.model_validate(PAYLOAD)
+
+        # Execute
+        first_request = first.to_stub().request
+        second_request = second.to_stub().request
+
+        # Assert
+        assert first_request.path is second_request.path
+        assert first_request.headers is second_request.headers
+        assert "/test" == first_request.path
+        assert {"a": "b", "c": "d"} == first_request.headers
+
+    def test_nested_payloads_convert_on_their_own(self):
+        # Setup
+        payload = StubPayload.model_validate(PAYLOAD)
+
+        # Execute
+        stub_request = payload.request.to_stub_request()
+        stub_action = payload.action.to_stub_action()
+
+        # Assert
+        assert "GET" == stub_request.method
+        assert stub_request.body is None
+        assert stub_action.proxy is None
+        assert stub_action.response is not None
+        assert stub_action.response.status_code == 200
+
+
+class TestApiAssertionPayload:
+    def test_to_api_assertion_default_times(self):
+        # Setup
+        payload = ApiAssertionPayload(path="/test")
+
+        # Execute
+        assertion = payload.to_api_assertion()
+
+        # Assert
+        assert "/test" == assertion.path
+        assert assertion.method is None
+        assert 1 == assertion.times
+        assert 5 == assertion.times
+
+    def test_to_api_assertion_times(self):
+        # Setup
+        payload = ApiAssertionPayload(path="/test", times={"$eq": {"value": 2}})
+
+        # Execute
+        assertion = payload.to_api_assertion()
+
+        # Assert
+        assert 2 == assertion.times
+        assert 1 != assertion.times
+
+
+class TestEnsureCriteria:
+    def test_non_finite_floats_survive_the_cache(self):
+        # Setup
+        ensure_str_criteria({"$lte": {"value": None}})
+
+        # Execute
+        criteria = ensure_str_criteria({"$lte": {"value": float("inf")}})
+
+        # Assert
+        assert isinstance(criteria, is_lte)
+        assert criteria.value == float("inf")
+        assert 10**6 == criteria
+
+    def test_reuses_criteria_regardless_of_key_order(self):
+        # Setup
+        first = ensure_dict_criteria({"x-first": "1", "x-second": "2"})
+
+        # Execute
+        second = ensure_dict_criteria({"x-second": "2", "x-first": "1"})
+
+        # Assert
+        assert first is second
@@ -0,0 +1,18 @@
+from assertive_mock_api_server.core import RequestLog
+
+from .helpers import make_request
+
+
+class TestRequestLog:
+    def test_get_requests_drops_oldest_when_full(self):
+        # Setup
+        log = RequestLog(max_size=2)
+        log.add(make_request("/first"))
+        log.add(make_request("/second"))
+        log.add(make_request("/third"))
+
+        # Execute
+        requests = log.get_requests()
+
+        # Assert
+        assert [request.path for request in requests] == ["/second", "/third"]
@@ -0,0 +1,94 @@
+import asyncio
+from types import MappingProxyType
+
+import httpx
+from assertive import is_eq
+
+from assertive_mock_api_server.core import (
+    MockApiRequest,
+    MockApiResponse,
+    MockApiResponsePool,
+    ResponseGenerator,
+    Stub,
+    StubAction,
+    StubProxy,
+    StubRequest,
+)
+
+
+def make_proxy_stub(proxy: StubProxy) -> Stub:
+    return Stub(
+        request=StubRequest(method=is_eq("GET"), path=is_eq("/proxied")),
+        action=StubAction(proxy=proxy),
+    )
+
+
+def make_proxied_request() -> MockApiRequest:
+    return MockApiRequest(
+        method="GET",
+        path="/proxied",
+        headers={"x-override": "request", "x-request-only": "kept"},
+        body="",
+        host="localhost",
+        query={"a": "1"},
+    )
+
+
+class TestResponseGeneratorProxy:
+    def test_proxy_sends_timeout_and_merged_headers_upstream(self):
+        # Setup
+        upstream_requests: list[httpx.Request] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            upstream_requests.append(request)
+            return httpx.Response(200, json={"proxied": True})
+
+        proxy = StubProxy(
+            url="http://upstream/target",
+            headers={"x-override": "proxy"},
+            timeout=3,
+        )
+
+        async def generate() -> MockApiResponse:
+            async with httpx.AsyncClient(
+                transport=httpx.MockTransport(handler)
+            ) as client:
+                generator = ResponseGenerator(client, MockApiResponsePool())
+                return await generator.generate(
+                    make_proxy_stub(proxy), make_proxied_request()
+                )
+
+        # Execute
+        response = asyncio.run(generate())
+
+        # Assert
+        assert response.status_code == 200
+        [upstream] = upstream_requests
+        assert upstream.extensions["timeout"] == httpx.Timeout(3).as_dict()
+        assert upstream.headers["x-override"] == "proxy"
+        assert upstream.headers["x-request-only"] == "kept"
+        assert upstream.url.params["a"] == "1"
+
+
+class TestStubProxyRequestExtensions:
+    def test_request_extensions_hold_the_timeout(self):
+        # Setup
+        proxy = StubProxy(url="http://upstream", timeout=3)
+
+        # Execute
+        extensions = proxy.request_extensions
+
+        # Assert
+        assert extensions["timeout"] == httpx.Timeout(3).as_dict()
+
+    def test_request_extensions_are_read_only(self):
+        # Setup
+        proxy = StubProxy(url="http://upstream", timeout=3)
+
+        # Execute
+        extensions = proxy.request_extensions
+
+        # Assert
+        assert proxy.request_extensions is extensions
+        assert isinstance(extensions, MappingProxyType)
+        assert isinstance(extensions["timeout"], MappingProxyType)
@@ -0,0 +1,34 @@
+from assertive_mock_api_server.core import MockApiResponsePool
+
+
+class TestMockApiResponsePool:
+    def test_acquire_reuses_released_response(self):
+        # Setup
+        pool = MockApiResponsePool()
+        first = pool.acquire(status_code=200, headers={}, body="first")
+        pool.release(first)
+
+        # Execute
+        second = pool.acquire(status_code=201, headers={"a": "b"}, body="second")
+
+        # Assert
+        assert second is first
+        assert second.status_code == 201
+        assert second.headers == {"a": "b"}
+        assert second.body == "second"
+
+    def test_release_drops_responses_when_full(self):
+        # Setup
+        pool = MockApiResponsePool(max_size=1)
+        first = pool.acquire(status_code=200, headers={}, body="first")
+        second = pool.acquire(status_code=200, headers={}, body="second")
+        pool.release(first)
+        pool.release(second)
+
+        # Execute
+        reused = pool.acquire(status_code=200, headers={}, body="reused")
+        fresh = pool.acquire(status_code=200, headers={}, body="fresh")
+
+        # Assert
+        assert reused is first
+        assert fresh is not second
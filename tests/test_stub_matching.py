@@ -140,3 +140,142 @@ class TestStubMatching:
 
         # Assert
         assert result is None
+
+    def test_find_best_match_non_literal_path(self):
+        # Setup
+        repo = StubRepository()
+        stub = Stub(
+            request=StubRequest(
+                path=is_eq("/test") | is_eq("/other"), method=is_eq("GET")
+            ),
+            action=StubAction(
+                response=StubResponse(status_code=200, headers={}, body="test")
+            ),
+        )
+        repo.add(stub)
+        request = MockApiRequest(
+            path="/other",
+            method="GET",
+            headers={},
+            body=None,
+            host="localhost",
+            query={},
+        )
+
+        # Execute
+        result = repo.find_best_match(request)
+
+        # Assert
+        assert result == stub
+
+    def test_find_best_match_equal_strength_prefers_latest(self):
+        # Setup
+        repo = StubRepository()
+        path_stub = Stub(
+            request=StubRequest(path=is_eq("/test"), host=is_eq("localhost")),
+            action=StubAction(
+                response=StubResponse(status_code=200, headers={}, body="path")
+            ),
+        )
+        method_path_stub = Stub(
+            request=StubRequest(path=is_eq("/test"), method=is_eq("GET")),
+            action=StubAction(
+                response=StubResponse(status_code=200, headers={}, body="method")
+            ),
+        )
+        latest_stub = Stub(
+            request=StubRequest(path=is_eq("/test"), host=is_eq("localhost")),
+            action=StubAction(
+                response=StubResponse(status_code=200, headers={}, body="latest")
+            ),
+        )
+        repo.add(path_stub)
+        repo.add(method_path_stub)
+        repo.add(latest_stub)
+        request = MockApiRequest(
+            path="/test",
+            method="GET",
+            headers={},
+            body=None,
+            host="localhost",
+            query={},
+        )
+
+        # Execute
+        result = repo.find_best_match(request)
+
+        # Assert
+        assert result == latest_stub
+
+    def test_find_best_match_only_counts_call_on_best_match(self):
+        # Setup
+        repo = StubRepository()
+        weak_stub = Stub(
+            request=StubRequest(path=is_eq("/test")),
+            action=StubAction(
+                response=StubResponse(status_code=200, headers={}, body="weak")
+            ),
+            max_calls=1,
+        )
+        strong_stub = Stub(
+            request=StubRequest(path=is_eq("/test"), method=is_eq("GET")),
+            action=StubAction(
+                response=StubResponse(status_code=200, headers={}, body="strong")
+            ),
+        )
+        repo.add(weak_stub)
+        repo.add(strong_stub)
+        get_request = MockApiRequest(
+            path="/test",
+            method="GET",
+            headers={},
+            body=None,
+            host="localhost",
+            query={},
+        )
+        post_request = MockApiRequest(
+            path="/test",
+            method="POST",
+            headers={},
+            body=None,
+            host="localhost",
+            query={},
+        )
+
+        # Execute
+        get_result = repo.find_best_match(get_request)
+        post_result = repo.find_best_match(post_request)
+
+        # Assert
+        assert get_result == strong_stub
+        assert post_result == weak_stub
+        assert strong_stub.call_count == 1
+        assert weak_stub.call_count == 1
+
+    def test_add_leaves_previous_index_untouched(self):
+        # Setup
+        repo = StubRepository()
+        first = Stub(
+            request=StubRequest(path=is_eq("/test"), method=is_eq("GET")),
+            action=StubAction(
+                response=StubResponse(status_code=200, headers={}, body="first")
+            ),
+        )
+        second = Stub(
+            request=StubRequest(path=is_eq("/test"), method=is_eq("GET")),
+            action=StubAction(
+                response=StubResponse(status_code=200, headers={}, body="second")
+            ),
+        )
+        repo.add(first)
+        previous_index = repo._index
+
+        # Execute
+        repo.add(second)
+
+        # Assert
+        assert repo._index is not previous_index
+        assert previous_index.stubs == (first,)
+        assert previous_index.by_method_path == {("GET", "/test"): ((0, first),)}
+        assert repo.list() == [first, second]
+        assert repo.stubs == (first, second)